@@ -4,59 +4,92 @@ GitHub Actions integration for PythonAnywhere Git Pipeline
 Uses GitHub Secrets for secure credential management
 """
 
-import os
+import atexit
 import sys
-from main import PythonAnywhereGitPipeline, PAWCredentials, load_credentials
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Optional
+from main import PythonAnywhereGitPipeline, PAWCredentials, configure_logging, load_credentials
 
 
-def deploy_to_pythonanywhere(project_path: str, branch: str = "main") -> bool:
+@lru_cache(maxsize=1)
+def _bootstrap() -> PythonAnywhereGitPipeline:
+    """
+    Load credentials and build the pipeline once per process
+    
+    Repeated deploys from the same process (e.g. several projects in one job)
+    share the credentials lookup and the pipeline's pooled HTTP session, which
+    is closed when the interpreter exits.
+    """
+    # Load credentials using smart hierarchy (GitHub Secrets → env vars automatically)
+    credentials = load_credentials()
+    
+    pipeline = PythonAnywhereGitPipeline(credentials)
+    atexit.register(pipeline.close)
+    return pipeline
+
+
+def deploy_to_pythonanywhere(project_path: str, branch: str = "main", probe: bool = False) -> bool:
     """
     Deploy project to PythonAnywhere using GitHub Secrets
     
     Args:
         project_path: Path to project on PythonAnywhere
         branch: Git branch to deploy
+        probe: Test the API connection before deploying (default: off, the
+               first console request surfaces connection errors anyway)
         
     Returns:
         True if deployment successful, False otherwise
     """
     try:
-        # Load credentials using smart hierarchy (GitHub Secrets → env vars automatically)
-        credentials = load_credentials()
-        
-        # Initialize pipeline
-        pipeline = PythonAnywhereGitPipeline(credentials)
+        # Credentials and pipeline are built once per process and reused
+        pipeline = _bootstrap()
         
         # Test connection
-        print("Testing connection to PythonAnywhere...")
-        if not pipeline.test_connection():
-            print("Failed to connect to PythonAnywhere API")
-            print("Possible issues:")
-            print("  1. Invalid PAW_TOKEN - check your API token")
-            print("  2. Incorrect PAW_USERNAME")
-            print("  3. Network connectivity issues")
-            print("  4. PythonAnywhere API endpoint changes")
-            print(f"  API Base URL: {pipeline.api_base}")
-            return False
+        if probe:
+            print("Testing connection to PythonAnywhere...")
+            if not pipeline.test_connection():
+                print("Failed to connect to PythonAnywhere API")
+                print("Possible issues:")
+                print("  1. Invalid PAW_TOKEN - check your API token")
+                print("  2. Incorrect PAW_USERNAME")
+                print("  3. Network connectivity issues")
+                print("  4. PythonAnywhere API endpoint changes")
+                print(f"  API Base URL: {pipeline.api_base}")
+                return False
+            
+            print("Connected to PythonAnywhere API")
         
-        print("Connected to PythonAnywhere API")
+        # Reuse an already-open bash console when PAW_CLI isn't configured;
+        # git needs a shell, so Python consoles are no use here
+        if not pipeline.console_id:
+            bash_consoles = [console for console in pipeline.list_available_consoles()
+                             if console.get('executable') == 'bash']
+            if bash_consoles:
+                pipeline.console_id = str(bash_consoles[0]['id'])
+                print(f"PAW_CLI not set - reusing open bash console {pipeline.console_id}")
+            else:
+                print("WARNING: PAW_CLI not set and no open bash console found!")
+                print("For reliable deployments, please:")
+                print("1. Open a bash console in PythonAnywhere dashboard")
+                print("2. Copy its console ID from the browser URL")
+                print("3. Set PAW_CLI secret in GitHub repository")
         
         # Execute deployment
         print(f"Deploying to {project_path} (branch: {branch})...")
         result = pipeline.execute_git_pull(project_path, branch)
         
-        if result['success']:
-            print("Deployment completed successfully!")
-            for cmd_result in result['results']:
-                if cmd_result['output'].strip():
-                    print(f"   {cmd_result['output'].strip()}")
-        else:
-            print("Deployment failed!")
-            if 'error' in result:
-                print(f"   Error: {result['error']}")
-            for cmd_result in result['results']:
-                if cmd_result.get('error'):
-                    print(f"   Command Error: {cmd_result['error']}")
+        # Collect the report and write it in one go once the deploy is done
+        lines = ["Deployment completed successfully!" if result['success'] else "Deployment failed!"]
+        if 'error' in result:
+            lines.append(f"   Error: {result['error']}")
+        for cmd_result in result.get('results', ()):
+            if cmd_result.get('error'):
+                lines.append(f"   Command Error: {cmd_result['error']}")
+            elif result['success'] and cmd_result['output'].strip():
+                lines.append(f"   {cmd_result['output'].strip()}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return result['success']
         
@@ -65,20 +98,58 @@ def deploy_to_pythonanywhere(project_path: str, branch: str = "main") -> bool:
         return False
 
 
+def _parse_args_fast(argv: list) -> Optional[SimpleNamespace]:
+    """
+    Parse the usual '--project-path X [--branch Y]' invocation without argparse
+    
+    Args:
+        argv: Command line arguments (without the program name)
+        
+    Returns:
+        Parsed arguments, or None if the full argparse parser is needed
+    """
+    options = {
+        '-p': 'project_path', '--project-path': 'project_path',
+        '-b': 'branch', '--branch': 'branch',
+    }
+    if len(argv) not in (2, 4):
+        return None
+    
+    values = {}
+    for flag, value in zip(argv[::2], argv[1::2]):
+        name = options.get(flag)
+        if name is None or name in values or value.startswith('-'):
+            return None
+        values[name] = value
+    
+    if 'project_path' not in values:
+        return None
+    return SimpleNamespace(project_path=values['project_path'],
+                           branch=values.get('branch', 'main'), probe=False)
+
+
 def main():
     """Main function for GitHub Actions"""
-    import argparse
-    
-    parser = argparse.ArgumentParser(description='Deploy to PythonAnywhere via GitHub Actions')
-    parser.add_argument('--project-path', '-p', required=True, 
-                       help='Project path on PythonAnywhere')
-    parser.add_argument('--branch', '-b', default='main', 
-                       help='Git branch to deploy (default: main)')
+    configure_logging()
     
-    args = parser.parse_args()
+    # The workflow always passes the same two options; only fall back to
+    # argparse for anything else (--help, --probe, malformed input)
+    args = _parse_args_fast(sys.argv[1:])
+    if args is None:
+        import argparse
+        
+        parser = argparse.ArgumentParser(description='Deploy to PythonAnywhere via GitHub Actions')
+        parser.add_argument('--project-path', '-p', required=True, 
+                           help='Project path on PythonAnywhere')
+        parser.add_argument('--branch', '-b', default='main', 
+                           help='Git branch to deploy (default: main)')
+        parser.add_argument('--probe', action='store_true',
+                           help='Test the API connection before deploying')
+        
+        args = parser.parse_args()
     
     # Deploy using GitHub Secrets
-    success = deploy_to_pythonanywhere(args.project_path, args.branch)
+    success = deploy_to_pythonanywhere(args.project_path, args.branch, args.probe)
     
     if success:
         print("GitHub Actions deployment completed successfully!")